@@ -18,6 +18,7 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 import sys
+import time
 
 from supriya import Server, synthdef
 from supriya.clocks import Clock
@@ -680,8 +681,10 @@ def main() -> None:
     arpeggio_pattern.play(clock=clock, context=server)
     pad_pattern.play(clock=clock, context=server)
 
+    # The clock plays the patterns on its own thread, so just sleep here
+    # until Ctrl-C, without keeping a CPU core busy.
     while True:
-        continue
+        time.sleep(1)
 
 if __name__ == '__main__':
     try:
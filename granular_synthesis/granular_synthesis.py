@@ -16,6 +16,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License 
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
+import random
 import sys
 import time
 from pathlib import Path
@@ -23,7 +24,7 @@ from pathlib import Path
 from supriya import AddAction, Bus, Envelope, Server, synthdef
 from supriya.clocks import Clock
 from supriya.conversions import midi_note_number_to_frequency
-from supriya.patterns import EventPattern, RandomPattern, SequencePattern
+from supriya.patterns import EventPattern, PatternPlayer, RandomPattern, SequencePattern
 from supriya.ugens import (
     CombL,
     Envelope,
@@ -391,10 +392,15 @@ def main() -> None:
         trigger_frequency=pad_sequence_pattern,
     )
 
+    # Draw the high hat amplitudes up front and cycle through them, rather
+    # than generating a new random value for every 1/16 note.  4096 values
+    # at 1/16 note each only repeat every few minutes.
+    high_hat_amplitudes = [random.uniform(0.08, 0.3) for _ in range(4096)]
+    high_hat_amplitude_pattern = SequencePattern(sequence=high_hat_amplitudes, iterations=None)
     high_hat_pattern = EventPattern(
         delta=0.0625, # 1/16 note
         duration=0.0625, # 1/16 note
-        amplitude=RandomPattern(minimum=0.08, maximum=0.3, iterations=None),
+        amplitude=high_hat_amplitude_pattern,
         buffer_id=time_tombs_sample_buffer.id_,
         grain_duration=0.09,
         grain_start=ten_thousand_years_start,
@@ -459,6 +465,15 @@ def main() -> None:
 
     clock = Clock()
     clock.start(beats_per_minute=bpm)
+
+    # Build all the pattern players up front, so that starting each pattern
+    # later on is only a matter of cueing it on the clock.
+    ambient_player = PatternPlayer(pattern=ambient_pattern, context=server, clock=clock)
+    bass_player = PatternPlayer(pattern=bass_pattern, context=server, clock=clock)
+    melody_player = PatternPlayer(pattern=melody_pattern, context=server, clock=clock)
+    high_hat_player = PatternPlayer(pattern=high_hat_pattern, context=server, clock=clock)
+    pad_player = PatternPlayer(pattern=pad_pattern, context=server, clock=clock)
+    snare_player = PatternPlayer(pattern=snare_pattern, context=server, clock=clock)
     
     # One-shot playback of the original sample
     server.add_synth(
@@ -467,15 +482,15 @@ def main() -> None:
         synthdef=sample_playback,
     )
     time.sleep(seconds_per_measure * 3)
-    ambient_pattern.play(clock=clock, context=server)
+    ambient_player.play()
     time.sleep(seconds_per_measure * 2)
-    bass_pattern.play(clock=clock, context=server)
+    bass_player.play()
     time.sleep(seconds_per_measure * 4)
-    melody_pattern.play(clock=clock, context=server)
-    high_hat_pattern.play(clock=clock, context=server)
+    melody_player.play()
+    high_hat_player.play()
     time.sleep(seconds_per_measure * 4)
-    pad_pattern.play(clock=clock, context=server)
-    snare_pattern.play(clock=clock, context=server)
+    pad_player.play()
+    snare_player.play()
 
     while True:
         time.sleep(1)
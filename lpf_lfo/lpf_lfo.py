@@ -35,12 +35,14 @@ from supriya.ugens import (
     SinOsc,
 )
 
+# Setting an LFO's phase to 1.5 * pi starts it from the bottom of the sine wave.
+BOTTOM_PHASE = 1.5 * pi
+
 @synthdef()
 def filter(in_bus=2, lfo_rate=1, resonance=0.05, out_bus=0) -> None:
     signal = In.ar(bus=in_bus, channel_count=2)
-    # A sine wave LFO. 
-    # Setting phase to 1.5 * pi starts it from the bottom of the sine wave.
-    mod_signal = SinOsc.ar(frequency=lfo_rate, phase=(1.5 * pi))
+    # A sine wave LFO, starting from the bottom of the sine wave.
+    mod_signal = SinOsc.ar(frequency=lfo_rate, phase=BOTTOM_PHASE)
     # Convert output to frequency range.
     mod_freq = LinExp.ar(
         input_minimum=-1.0, 
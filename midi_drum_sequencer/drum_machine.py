@@ -16,18 +16,25 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import contextlib
 import fractions
+import os
+import selectors
+import sys
 import threading
-from collections import defaultdict
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 from mido import get_input_names, Message, open_input
-from mido.ports import MultiPort
+from mido.ports import BaseInput
 
-from supriya import Server, SynthDef
+from supriya import AddAction, Bus, Server, Synth, SynthDef
 from supriya.clocks import Clock, ClockContext, TimeUnit
 
 from synth_defs import (
+    ALL_SYNTHDEFS,
     bass_drum,
     clap_dry,
     claves,
@@ -41,12 +48,69 @@ from synth_defs import (
     maracas,
     medium_conga,
     medium_tom,
+    metal_source,
     open_high_hat,
     rim_shot,
     snare,
 )
 
 
+# The MIDI channel of a Note On message picks the drum that's played.
+MIDI_CHANNEL_TO_SYNTHDEF: tuple[SynthDef, ...] = (
+    bass_drum,
+    snare,
+    low_tom,
+    medium_tom,
+    high_tom,
+    low_conga,
+    medium_conga,
+    high_conga,
+    rim_shot,
+    clap_dry,
+    claves,
+    maracas,
+    cow_bell,
+    cymbal,
+    open_high_hat,
+    closed_high_hat,
+)
+# These drums read their oscillators from the shared metal_source synth.
+METAL_SYNTHDEFS: tuple[SynthDef, ...] = (closed_high_hat, open_high_hat, cymbal)
+SEQUENCER_STEPS: int = 16
+# SEQUENCER_STEPS is a power of two, so a step can wrap with a mask instead of a modulo.
+STEP_MASK: int = SEQUENCER_STEPS - 1
+# How long after its step a sequenced hit plays.  This is used as the
+# server's latency, which supriya adds to every timestamped bundle.  It gives
+# the bundle time to reach the server even if Python is briefly held up.
+LOOKAHEAD_SECONDS: float = 0.01
+# Ports whose names contain any of these are skipped unless asked for by name,
+# e.g. Linux's "Midi Through" loopback and RtMidi's own virtual ports.
+SKIPPED_PORT_NAMES: tuple[str, ...] = ('Through', 'RtMidi')
+
+
+@contextlib.contextmanager
+def _real_time_priority() -> Iterator[None]:
+    """Run the block with SCHED_FIFO scheduling, where that's allowed.
+
+    Threads inherit the scheduling policy of the thread that creates
+    them, so MIDI backend threads started inside the block run with
+    real-time priority too.  On Linux this needs root or CAP_SYS_NICE.
+    Without it, and on other platforms, the block runs unchanged.
+    """
+    try:
+        original_policy = os.sched_getscheduler(0)
+        original_param = os.sched_getparam(0)
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+    except (AttributeError, OSError):
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        os.sched_setscheduler(0, original_policy, original_param)
+
+
 class SequencerMode(Enum):
     # Used to track the current state of the sequencer
     PERFORM = 0
@@ -54,62 +118,74 @@ class SequencerMode(Enum):
     RECORD = 2
 
 
+# The commands offered to the user in each mode.
+INPUT_OPTIONS: dict[SequencerMode, str] = {
+    SequencerMode.PERFORM: 'Options are:\n*Perform\n*Playback\n*Record\n*Exit\n',
+    SequencerMode.PLAYBACK: 'Options are:\n*Stop\n*Exit\n',
+    SequencerMode.RECORD: 'Options are:\n*Stop\n*Clear\n*Exit\n',
+}
+
+
 class DrumMachine:
-    def __init__(self, bpm: int, quantization: str):
+    def __init__(self, bpm: int, quantization: str, ports: tuple[str, ...] = ()):
         self.bpm = bpm
         self.clock: Clock = self._init_clock()
         self.clock_event_id: int | None = None
-        self.MIDI_CHANNEL_TO_SYNTHDEF: list[SynthDef] = [
-            bass_drum,
-            snare,
-            low_tom,
-            medium_tom,
-            high_tom,
-            low_conga,
-            medium_conga,
-            high_conga,
-            rim_shot,
-            clap_dry,
-            claves,
-            maracas,
-            cow_bell,
-            cymbal,
-            open_high_hat,
-            closed_high_hat,
-        ]
-        self.multiport = self._open_multiport()
-        self.quantization_delta = self._quantization_to_beats(quantization=quantization)
-        self.recorded_notes: dict[float, list[Message]] = defaultdict(list)
+        # Kept as an exact fraction, so that step math doesn't pick up rounding errors.
+        self.quantization_delta: fractions.Fraction = self._quantization_to_beats(quantization=quantization)
+        # What the sequencer's clock callback returns on every step.  The clock
+        # works in floats, so the delta is converted once here.
+        self._clock_callback_result: tuple[float, TimeUnit] = (float(self.quantization_delta), TimeUnit.BEATS)
+        # One list of recorded hits per step, indexed by the step number.
+        # Each hit is stored as its MIDI channel, which picks the drum.
+        self.recorded_notes: list[list[int]] = [[] for _ in range(SEQUENCER_STEPS)]
+        # When recording started, used to work out which step a note landed on.
+        self.record_start_ns: int = 0
         self.sequencer_mode: Enum = SequencerMode.PERFORM
-        self.SEQUENCER_STEPS: int = 16
+        # Plain flags mirroring sequencer_mode, for the MIDI callback to check.
+        self._recording: bool = False
+        self._playing: bool = False
+        self.step_duration_ns: int = self._step_duration_ns()
         self.server: Server = self._init_server()
-        self.stop_listening_for_input: threading.Event = threading.Event()
+        self.metal_bus: Bus = self.server.add_bus(calculation_rate='audio')
+        self.metal_source_synth: Synth = self.server.add_synth(synthdef=metal_source, out_bus=self.metal_bus)
+        self.drum_synths: list[Synth] = self._init_drum_synths()
+        # Each drum synth's bound set method, indexed by MIDI channel.
+        self._trigger: list[Callable[..., None]] = [synth.set for synth in self.drum_synths]
+        self.stop_listening_for_input: bool = False
+        self.keyboard_input_thread: threading.Thread | None = None
+        # Open the ports last, as messages can arrive as soon as they're open.
+        self.inports: list[BaseInput] = self._open_inports(ports=ports)
 
     def _init_server(self) -> Server:
         """Start the server and load SynthDefs"""
         server = Server().boot()
-        server.add_synthdefs(
-            bass_drum,
-            clap_dry,
-            claves,
-            closed_high_hat,
-            cow_bell,
-            cymbal,
-            high_conga,
-            high_tom,
-            low_conga,
-            low_tom,
-            maracas,
-            medium_conga,
-            medium_tom,
-            open_high_hat,
-            rim_shot,
-            snare,
-        )
+        # Timestamped bundles play this long after their time, rather than
+        # the default 0.1 seconds.
+        server.set_latency(latency=LOOKAHEAD_SECONDS)
+        # All of the SynthDefs go in a single /d_recv.
+        server.add_synthdefs(*ALL_SYNTHDEFS)
         # Wait for the server to fully load the SynthDef before proceeding.
         server.sync()
 
         return server
+
+    def _init_drum_synths(self) -> list[Synth]:
+        """Create one long-lived synth per drum, in MIDI channel order.
+
+        Playing a drum just retriggers its synth, rather than creating
+        a new synth for every note.
+
+        The drums are added after the metal source synth, so that the
+        hi-hats and cymbal read its output in the same control block.
+        """
+        drum_synths = []
+        for drum_synthdef in MIDI_CHANNEL_TO_SYNTHDEF:
+            settings = {'metal_bus': self.metal_bus} if drum_synthdef in METAL_SYNTHDEFS else {}
+            drum_synths.append(self.server.add_synth(synthdef=drum_synthdef, add_action=AddAction.ADD_TO_TAIL, **settings))
+        self.server.sync()
+
+        return drum_synths
     
     def _init_clock(self) -> Clock:
         """Create the clock and set the BPM."""
@@ -118,15 +194,56 @@ class DrumMachine:
         clock.change(beats_per_minute=self.bpm)
         # This helper function converts a string like '1/16' into a numeric value
         # used by the clock.
-        clock.start()
+        # The clock creates its thread when started, so starting it with
+        # real-time priority lets the sequencer's callback run with it too.
+        with _real_time_priority():
+            clock.start()
 
         return clock
     
-    def _open_multiport(self) -> MultiPort:
-        """Open all MIDI input ports."""
-        inports = [open_input(p) for p in get_input_names()]
-        
-        return MultiPort(inports)
+    def _open_inports(self, ports: tuple[str, ...] = ()) -> list[BaseInput]:
+        """Open the MIDI input ports.
+
+        Each port calls handle_midi_message from the MIDI backend's own
+        thread as soon as a message arrives, so there's no need to poll
+        the ports for pending messages.
+
+        Args:
+            ports: only open ports whose names contain one of these.
+                If empty, open every port except loopback and virtual ones.
+        """
+        port_names = []
+        for port_name in get_input_names():
+            if ports:
+                if not any(p in port_name for p in ports):
+                    continue
+            elif any(p in port_name for p in SKIPPED_PORT_NAMES):
+                continue
+            port_names.append(port_name)
+
+        # Open the ports with real-time priority, so the backend threads that
+        # run the callbacks get it.  Other threads keep the default priority.
+        # The ports are opened in parallel, as each open can take a while.
+        with _real_time_priority(), ThreadPoolExecutor(max_workers=len(port_names) or 1) as executor:
+            inports = list(executor.map(self._open_inport, port_names))
+
+        return inports
+
+    def _open_inport(self, port_name: str) -> BaseInput:
+        """Open a single MIDI input port, with handle_midi_message as its callback.
+
+        Args:
+            port_name: the name of the port to open.
+        """
+        inport = open_input(port_name, callback=self.handle_midi_message)
+        # Drop SysEx, MIDI clock and active sensing messages in the
+        # backend, so they never wake up the callback.  Only the
+        # rtmidi backend supports this.
+        rt_midi_in = getattr(inport, '_rt', None)
+        if rt_midi_in is not None:
+            rt_midi_in.ignore_types(sysex=True, timing=True, active_sense=True)
+
+        return inport
 
     def consume_keyboard_input(self) -> None:
         """The thread that receives user keyboard input.
@@ -153,110 +270,155 @@ class DrumMachine:
         """
         input_prompt = 'Enter a command:\n'
 
-        while not self.stop_listening_for_input.is_set():
-            input_options = 'Options are:\n*Perform\n*Playback\n*Record\n*Exit\n'
-
-            if self.sequencer_mode == SequencerMode.PLAYBACK:
-                input_options = 'Options are:\n*Stop\n*Exit\n'
-
-            if self.sequencer_mode == SequencerMode.RECORD:
-                input_options = 'Options are:\n*Stop\n*Clear\n*Exit\n'
-
-            command = input(f'{input_prompt}(Current mode is {SequencerMode(self.sequencer_mode).name})\n{input_options}> ')
+        while not self.stop_listening_for_input:
+            command = self._read_command(prompt=f'{input_prompt}(Current mode is {self.sequencer_mode.name})\n{INPUT_OPTIONS[self.sequencer_mode]}> ')
+            if command is None:
+                # exit() was called while waiting for input.
+                break
             command = command.upper()
             
             if command == "STOP":
-                if self.sequencer_mode == SequencerMode.PLAYBACK:
+                if self._playing:
                     self.stop_playback()
                 
                 # Set mode to PERFORM when stopping either PLAYBACK or RECORD.
-                self.sequencer_mode = SequencerMode.PERFORM
+                self._set_mode(mode=SequencerMode.PERFORM)
+                continue
             
             if command == "CLEAR":
                 # Delete all recorded notes.
-                self.recorded_notes.clear()
+                for step_notes in self.recorded_notes:
+                    step_notes.clear()
+                continue
 
             if command == "EXIT":
                 # Quit the program.
                 self.exit()
                 break
             
-            if command not in SequencerMode.__members__:
-                    print('Incorrect command.  Please try again.')
-            else:
-                if self.sequencer_mode == SequencerMode[command]:
-                    # No need to reassign.
-                    continue
-                
-                if self.sequencer_mode == SequencerMode.PLAYBACK and SequencerMode[command] != SequencerMode.PLAYBACK:
-                    self.stop_playback()
+            mode = SequencerMode.__members__.get(command)
+            if mode is None:
+                print('Incorrect command.  Please try again.')
+                continue
+
+            if mode is self.sequencer_mode:
+                # No need to reassign.
+                continue
+            
+            if self._playing:
+                # Switching away from PLAYBACK.
+                self.stop_playback()
+
+            if mode is SequencerMode.RECORD:
+                self.record_start_ns = time.monotonic_ns()
 
-                self.sequencer_mode = SequencerMode[command]
+            self._set_mode(mode=mode)
 
-            if self.sequencer_mode == SequencerMode.PLAYBACK:
+            if self._playing:
                 self.start_playback()
     
+    def _set_mode(self, mode: SequencerMode) -> None:
+        """Change the sequencer's mode, and the flags that mirror it.
+
+        Args:
+            mode: the new mode.
+        """
+        self.sequencer_mode = mode
+        self._recording = mode is SequencerMode.RECORD
+        self._playing = mode is SequencerMode.PLAYBACK
+
+    def _read_command(self, prompt: str) -> str | None:
+        """Print the prompt and wait for the user to enter a command.
+
+        Rather than blocking in input() until Enter is pressed, stdin is
+        checked with a short timeout, so the thread notices when exit()
+        has been called.  Returns None in that case.  Where stdin can't
+        be waited on (e.g. Windows), fall back to input().
+
+        Args:
+            prompt: the text shown to the user.
+        """
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (OSError, ValueError):
+            selector.close()
+            return input(prompt)
+
+        print(prompt, end='', flush=True)
+        with selector:
+            while not self.stop_listening_for_input:
+                try:
+                    ready = selector.select(timeout=0.2)
+                except OSError:
+                    # Windows accepts stdin in register(), but can only
+                    # select() on sockets.  The prompt is already shown.
+                    return input()
+
+                if ready:
+                    line = sys.stdin.readline()
+                    # An empty string means stdin was closed, so treat it as Exit.
+                    return line.strip() if line else 'EXIT'
+
+        return None
+
     def handle_midi_message(self, message: Message) -> None:
         """Deal with a new MIDI message.
 
-        This function currently only handles Note On messages.
+        Only Note On messages are handled.  The MIDI channel needs to
+        be different for each drum.  It also needs to be in the range
+        0-15, as the channel is used as an index into the drum synths.
+
+        When recording, the note is placed on the step closest
+        to when it arrived, counting from when recording started.
 
         Args:
             message: a MIDI message.
         """
-        if message.type == 'note_on':
-            self.on_note_on(message=message)
+        if message.type != 'note_on':
+            return
+
+        # Take the time first, so that it's as close to the note's arrival as possible.
+        arrival_ns = time.monotonic_ns()
+        self._trigger[message.channel](t_trig=1)
+
+        if self._recording:
+            # Snap the note to the nearest step, wrapping around the sequence.
+            # This makes playback very simple because for each invocation of 
+            # the clock's callback, we can simply check for messages at that step.
+            step = round((arrival_ns - self.record_start_ns) / self.step_duration_ns) & STEP_MASK
+            # The step list already says when the note plays, and the channel
+            # picks the drum, so the channel is all that's needed to play it again.
+            self.recorded_notes[step].append(message.channel)
 
     def listen_for_keyboard_input(self):
         """Starts the thread that listens for keyboard input."""
-        consumer_thread = threading.Thread(target=self.consume_keyboard_input, daemon=True)
-        consumer_thread.start()
+        self.keyboard_input_thread = threading.Thread(target=self.consume_keyboard_input, daemon=True)
+        self.keyboard_input_thread.start()
     
     def listen_for_midi_messages(self) -> None:
-        """Listen for incoming MIDI messages in a non-blocking way.
+        """Listen for incoming MIDI messages until told to stop.
         
-        Mido's iter_pending() is non-blocking.
+        The input ports deliver messages through their callbacks, so
+        this just blocks until the keyboard input thread finishes, which
+        happens once the user exits.
         """
-        while not self.stop_listening_for_input.is_set():
-            for message in self.multiport.iter_pending():
-                self.handle_midi_message(message=message)
+        self.keyboard_input_thread.join()
     
-    def on_note_on(self, message: Message) -> None:
-        """Handle MIDI Note On messages.
-
-        The MIDI channel need to be different for each drum.
-        It also need to be in the range 0-15, as the channel
-        is used as an index into an array of SynthDefs.
-
-        There is no restriction on the MIDI note value,
-        other than it be in the usual 0-127 MIDI note range.
-        Whatever the value, it will be converted into 
-        the range 0-15.  This is done so that each MIDI
-        note value corresponds to a 1/6th note.
-
-        Args:
-            message: a MIDI Note On message.
-        """
-        # Use the MIDI channel as the index into an array of SynthDefs
-        # to choose the right one.
-        drum_synthdef = self.MIDI_CHANNEL_TO_SYNTHDEF[message.channel]
-        _ = self.server.add_synth(synthdef=drum_synthdef)
-
-        if self.sequencer_mode == SequencerMode.RECORD:
-            # recorded_time is in a factor of quantization_delta, and is based
-            # on the scaled value of the message's note.
-            # This makes playback very simple because for each invocation of 
-            # the clock's callback, we can simply check for messages at the delta.
-            recorded_time = (message.note % self.SEQUENCER_STEPS) * self.quantization_delta
-            recorded_message = message.copy(time=recorded_time)
-            self.recorded_notes[recorded_time].append(recorded_message)
-
-    def _quantization_to_beats(self, quantization: str) -> float:
+    def _quantization_to_beats(self, quantization: str) -> fractions.Fraction:
         fraction = fractions.Fraction(quantization.replace("T", ""))
         if "T" in quantization:
             fraction *= fractions.Fraction(2, 3)
         
-        return float(fraction)
+        return fraction
+
+    def _step_duration_ns(self) -> int:
+        """How long one step of the sequence lasts, in nanoseconds.
+
+        Clock offsets are measured in whole notes, and the BPM counts
+        quarter notes, so a whole note lasts 240 / BPM seconds.
+        """
+        return round(self.quantization_delta * 240 * 1_000_000_000 / self.bpm)
 
     def run(self) -> None:
         """Start the drum machine and sequencer."""
@@ -266,29 +428,31 @@ class DrumMachine:
     def sequencer_clock_callback(
         self,
         context: ClockContext, 
-        delta: float, 
     ) -> tuple[float, TimeUnit]:
         """The function that runs on each invocation.
 
-        The callback is executed once every `delta`.  What delta means depends on time_unit.  
-        Options for time_unit are BEATS or SECONDS.  If you want this function to called
-        once every 1/4, 1/8, or 1/16 note, then time_unit should be BEATS.  Otherwise
-        you can specify SECONDS as the time_unit to have it called outside of a 
-        musical rhythmic context.
+        The callback is executed once every quantization delta, in BEATS.  
+        The delta never changes, so the same (delta, time_unit) tuple is 
+        returned every time.
         """
-        recorded_notes_index = delta * (context.event.invocations % self.SEQUENCER_STEPS )
-
-        midi_messages = self.recorded_notes[recorded_notes_index]
-        for message in midi_messages:
-            self.handle_midi_message(message)
+        step = context.event.invocations & STEP_MASK
+
+        channels = self.recorded_notes[step]
+        if channels:
+            # Look the trigger table up once, rather than once per hit.
+            trigger = self._trigger
+            # Send all of the step's hits in one timestamped OSC bundle, so the
+            # server starts them together, LOOKAHEAD_SECONDS after the step.
+            with self.server.at(seconds=context.desired_moment.seconds):
+                for channel in channels:
+                    trigger[channel](t_trig=1)
         
-        return delta, TimeUnit.BEATS
+        return self._clock_callback_result
 
     def start_playback(self) -> None:
         """Start playing back the sequenced drum pattern."""
         self.clock_event_id = self.clock.cue(
             procedure=self.sequencer_clock_callback, 
-            kwargs={'delta': self.quantization_delta},
             quantization='1/4'
         )
 
@@ -299,6 +463,7 @@ class DrumMachine:
 
     def exit(self) -> None:
         """Exit the drum machine and sequencer."""
-        self.stop_listening_for_input.set()
-        self.multiport.close()
+        self.stop_listening_for_input = True
+        for inport in self.inports:
+            inport.close()
         self.server.quit()
@@ -26,16 +26,19 @@ import click
 
 from supriya.clocks import Quantization
 
-from drum_machine import DrumMachine
-
 @click.command()
 @click.option('-b', '--bpm', default=120, type=int, help='Beats per minute.')
 @click.option('-q', '--quantization', default='1/16', type=str, help='The rhythmic value for sequenced notes.')
-def start(bpm: int, quantization: str) -> None:
+@click.option('-p', '--port', 'ports', multiple=True, type=str, help='Only use MIDI inputs whose names contain this. Can be given more than once.')
+def start(bpm: int, quantization: str, ports: tuple[str, ...]) -> None:
     verify_bpm(bpm=bpm)
     verify_quantization(quantization=quantization)
 
-    drum_machine = DrumMachine(bpm=bpm, quantization=quantization)
+    # Imported here so that --help and bad arguments don't pay for
+    # building all of the drum SynthDefs.
+    from drum_machine import DrumMachine
+
+    drum_machine = DrumMachine(bpm=bpm, quantization=quantization, ports=ports)
     drum_machine.run()
     stop()
 
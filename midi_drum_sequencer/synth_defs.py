@@ -22,9 +22,9 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
-from math import pi
+from math import pi, sqrt
 
-from supriya import Envelope, synthdef
+from supriya import Envelope, synthdef, SynthDef
 from supriya.ugens import (
     BBandPass,
     BHiPass,
@@ -35,37 +35,73 @@ from supriya.ugens import (
     DelayN,
     EnvGen,
     HPF,
+    In,
     LFTri, 
     LFPulse,
     Limiter,
     LPF,
+    Mix,
     Out,
     Pan2,
+    Phasor,
+    SampleDur,
     SinOsc,
     WhiteNoise, 
 )
 
-@synthdef()
+# Each drum runs as a single synth that lives as long as the server does,
+# and setting t_trig restarts its envelopes.  An envelope holds its initial
+# level until it's first triggered, so every amplitude envelope starts at 0.
+
+# Restarting the sines at this phase makes every hit start at their peak, like a cosine.
+HALF_PI = pi / 2
+
+# Pan2's level on each side at position 0.  The drums that were panned to the
+# centre now write the same signal to both outputs, scaled by this, so they're
+# exactly as loud as they were through Pan2.
+CENTER_PAN_LEVEL = sqrt(0.5)
+
+# The frequencies of the six square waves behind the hi-hats and cymbal.
+METAL_FREQUENCIES = [203.52, 366.31, 301.77, 518.19, 811.16, 538.75]
+
+def _cycle(frequency, trigger):
+    """Track how far through its cycle an oscillator is, from 0 to 1.
+
+    The drums' synths keep running between hits, so their oscillators
+    would otherwise carry on from wherever the last hit left them.
+    This goes back to 0 whenever the trigger fires instead.
+    """
+    return Phasor.ar(trigger=trigger, rate=frequency * SampleDur.ir())
+
+def _sine(cycle):
+    """A sine that's at its peak at the start of the cycle."""
+    return SinOsc.ar(frequency=0, phase=cycle * (2 * pi) + HALF_PI)
+
+@synthdef('tr')
 def bass_drum(
+    t_trig=0,
     amplitude=0.5,
     out_bus=0,
 ) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.11, 1, 0], durations=[0, 30], curves=[-225.0]), done_action=2)
-    trienv = EnvGen.kr(envelope=Envelope(amplitudes=[0.11, 0.6, 0], durations=[0, 30], curves=[-230.0]), done_action=0)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[56*7, 56*1.35, 56], durations=[0.05, 0.6], curves=[-14.0]))
-    pfenv = EnvGen.kr(envelope=Envelope(amplitudes=[56*7, 56*1.35, 56], durations=[0.03, 0.6], curves=[-10.0]))
+    env = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 30], curves=[-225.0]), gate=t_trig, done_action=0)
+    trienv = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.6, 0], durations=[0, 30], curves=[-230.0]), gate=t_trig, done_action=0)
+    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[56*7, 56*1.35, 56], durations=[0.05, 0.6], curves=[-14.0]), gate=t_trig)
+    pfenv = EnvGen.kr(envelope=Envelope(amplitudes=[56*7, 56*1.35, 56], durations=[0.03, 0.6], curves=[-10.0]), gate=t_trig)
     
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2) * env
-    sub = LFTri.ar(frequency=fenv, initial_phase=pi/2) * trienv * 0.05
-    punch = SinOsc.ar(frequency=pfenv, phase=pi/2) * env * 2
+    cycle = _cycle(frequency=fenv, trigger=t_trig)
+    sig = _sine(cycle=cycle) * env
+    # LFTri's phase can't be reset, so this is the triangle it would
+    # make from an initial phase of HALF_PI, built from the same cycle.
+    sub = (1 - abs((cycle * 4 + (HALF_PI + 1)) % 4 - 2)) * (trienv * 0.05)
+    punch = _sine(cycle=_cycle(frequency=pfenv, trigger=t_trig)) * (env * 2)
     punch = HPF.ar(source=punch, frequency=350)
     sig = (sig + sub + punch) * 2.5
-    sig = Limiter.ar(source=sig, level=0.5) * amplitude
-    sig = Pan2.ar(source=sig, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    sig = Limiter.ar(source=sig, level=0.5) * (amplitude * CENTER_PAN_LEVEL)
+    Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
+@synthdef('tr')
 def snare(
+    t_trig=0,
     amplitude=0.5, 
     amplitude_2=0.5,
     out_bus=0,
@@ -73,243 +109,232 @@ def snare(
     tone=340.0, 
     tone_2=189.0, 
 ) -> None:
-    noiseEnv = EnvGen.kr(envelope=Envelope.percussive(0.001, 4.2, 1, -115), done_action=2)
-    atkEnv = EnvGen.kr(envelope=Envelope.percussive(0.001, 0.8, curve=-95), done_action=0)
+    noiseEnv = EnvGen.kr(envelope=Envelope.percussive(0.001, 4.2, 1, -115), gate=t_trig, done_action=0)
+    atkEnv = EnvGen.kr(envelope=Envelope.percussive(0.001, 0.8, curve=-95), gate=t_trig, done_action=0)
     noise = WhiteNoise.ar()
     noise = HPF.ar(source=noise, frequency=1800)
     noise = LPF.ar(source=noise, frequency=8850)
-    noise = noise * noiseEnv * snappy
-    osc1 = SinOsc.ar(frequency=tone_2, phase=pi/2) * 0.6
-    osc2 = SinOsc.ar(frequency=tone, phase=pi/2) * 0.7
-    sum = (osc1 + osc2) * atkEnv * amplitude_2
-    sig = Pan2.ar(source=(noise + sum) * amplitude * 2.5, position=0.0)
+    noise = noise * (noiseEnv * snappy)
+    osc1 = _sine(cycle=_cycle(frequency=tone_2, trigger=t_trig)) * 0.6
+    osc2 = _sine(cycle=_cycle(frequency=tone, trigger=t_trig)) * 0.7
+    sum = (osc1 + osc2) * (atkEnv * amplitude_2)
+    sig = (noise + sum) * (amplitude * (2.5 * CENTER_PAN_LEVEL))
     sig = HPF.ar(source=sig, frequency=340)
-    Out.ar(bus=out_bus, source=sig)
+    Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
+@synthdef('tr')
 def clap_dry(
+    t_trig=0,
     amplitude=0.5, 
     out_bus=0,
 ) -> None:
-    atkenv = EnvGen.kr(envelope=Envelope(amplitudes=[0.5,1,0], durations=[0, 0.3], curves=[-160.0]), done_action=2)
-    denv = EnvGen.kr(envelope=Envelope.adsr(0, 6, 0, 1, 1, curve=-157), done_action=0)
-    atk = WhiteNoise.ar() * atkenv * 1.4
-    decay = DelayN.ar(source=WhiteNoise.ar(), maximum_delay_time=0.026, delay_time=0.026) * denv
-    sum = atk + decay * amplitude
+    atkenv = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 0.3], curves=[-160.0]), gate=t_trig, done_action=0)
+    denv = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 6], curves=[-157.0]), gate=t_trig, done_action=0)
+    # The filters are linear, so the output gain is applied with the envelopes.
+    atk = WhiteNoise.ar() * (atkenv * (1.4 * 1.5 * CENTER_PAN_LEVEL))
+    decay = DelayN.ar(source=WhiteNoise.ar(), maximum_delay_time=0.026, delay_time=0.026) * (denv * (amplitude * (1.5 * CENTER_PAN_LEVEL)))
+    sum = atk + decay
     sum = HPF.ar(source=sum, frequency=500)
     sum = BPF.ar(source=sum, frequency=1062, reciprocal_of_q=0.5)
-    Out.ar(bus=out_bus, source=Pan2.ar(source=sum * 1.5, position=0))
+    Out.ar(bus=out_bus, source=[sum, sum])
 
-@synthdef()
-def low_tom(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.4, 1, 0], durations=[0, 20], curves=[-250]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[80*1.25, 80*1.125, 80], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2) * env
-    sig = Pan2.ar(source=sig * amplitude * 3, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+def _tom_synthdef(
+    name: str,
+    decay: float,
+    frequencies: tuple[float, float, float],
+    gain: float,
+) -> SynthDef:
+    """Build a tom or conga SynthDef.
 
-@synthdef()
-def medium_tom(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.4, 1, 0], durations=[0, 16], curves=[-250.0]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[120*1.33333, 120*1.125, 120], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2)
-    sig = Pan2.ar(source=sig * env * amplitude * 2, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    These drums are all the same sine with a falling pitch, and only
+    differ in their tuning and level.
 
-@synthdef()
-def high_tom(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.4, 1, 0], durations=[0, 11], curves=[-250.0]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[165*1.333333, 165*1.121212, 165], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2)
-    sig = Pan2.ar(source=sig * env * amplitude * 2, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    Args:
+        name: the SynthDef's name.
+        decay: how long the amplitude envelope takes to fall away.
+        frequencies: the starting pitch, the pitch after 0.1 seconds, 
+            and the pitch it settles on, in hertz.
+        gain: how much to boost the output by.
+    """
+    def tom(
+        t_trig=0,
+        amplitude=0.5, 
+        out_bus=0
+    ) -> None:
+        env = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, decay], curves=[-250.0]), gate=t_trig, done_action=0)
+        fenv = EnvGen.kr(envelope=Envelope(amplitudes=list(frequencies), durations=[0.1, 0.5], curves=[-4.0]), gate=t_trig)
+        sig = _sine(cycle=_cycle(frequency=fenv, trigger=t_trig))
+        sig = sig * (env * (amplitude * (gain * CENTER_PAN_LEVEL)))
+        Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
-def low_conga(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.15, 1, 0], durations=[0, 18], curves=[-250.0]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[165*1.333333, 165*1.121212, 165], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2) * env
-    sig = Pan2.ar(source=sig * amplitude * 3, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    # The decorator names the SynthDef after the function.
+    tom.__name__ = name
+    return synthdef('tr')(tom)
 
-@synthdef()
-def medium_conga(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.15, 1, 0], durations=[0, 9], curves=[-250.0]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[250*1.24, 250*1.12, 250], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2)
-    sig = Pan2.ar(source=sig * env * amplitude * 2, position=0)
-    Out.ar(bus=out_bus, source=sig)
+low_tom = _tom_synthdef(name='low_tom', decay=20, frequencies=(100.0, 90.0, 80.0), gain=3)
+medium_tom = _tom_synthdef(name='medium_tom', decay=16, frequencies=(160.0, 135.0, 120.0), gain=2)
+high_tom = _tom_synthdef(name='high_tom', decay=11, frequencies=(220.0, 185.0, 165.0), gain=2)
+low_conga = _tom_synthdef(name='low_conga', decay=18, frequencies=(220.0, 185.0, 165.0), gain=3)
+medium_conga = _tom_synthdef(name='medium_conga', decay=9, frequencies=(310.0, 280.0, 250.0), gain=2)
+high_conga = _tom_synthdef(name='high_conga', decay=6, frequencies=(455.0, 400.0, 370.0), gain=2)
 
-@synthdef()
-def high_conga(
-    amplitude=0.5, 
-    out_bus=0
-) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.15, 1, 0], durations=[0, 6], curves=[-250.0]), done_action=2)
-    fenv = EnvGen.kr(envelope=Envelope(amplitudes=[370*1.22972, 370*1.08108, 370], durations=[0.1, 0.5], curves=[-4.0]))
-    sig = SinOsc.ar(frequency=fenv, phase=pi/2)
-    sig = Pan2.ar(source=sig * env * amplitude * 2, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
-
-@synthdef()
+@synthdef('tr')
 def rim_shot(
+    t_trig=0,
     amplitude=0.5, 
     out_bus=0
 ) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[1, 1, 0], durations=[0.00272, 0.07], curves=[-42.0]), done_action=2)
-    tri1 = LFTri.ar(frequency=1667 * 1.1, initial_phase=1) * env
-    tri2 = LFPulse.ar(frequency=455 * 1.1, width=0.8) * env
-    punch = WhiteNoise.ar() * env * 0.46
-    sig = tri1 + tri2 + punch
+    env = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 1, 0], durations=[0, 0.00272, 0.07], curves=[-42.0]), gate=t_trig, done_action=0)
+    tri1 = LFTri.ar(frequency=1667 * 1.1, initial_phase=1)
+    tri2 = LFPulse.ar(frequency=455 * 1.1, width=0.8)
+    punch = WhiteNoise.ar() * 0.46
+    # The filters are linear, so the output gain is applied with the envelope.
+    sig = (tri1 + tri2 + punch) * (env * (amplitude * CENTER_PAN_LEVEL))
     sig = BPeakEQ.ar(source=sig, frequency=464, reciprocal_of_q=0.44, gain=8)
     sig = HPF.ar(source=sig, frequency=315)
     sig = LPF.ar(source=sig, frequency=7300)
-    sig = Pan2.ar(source=sig * amplitude, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
+@synthdef('tr')
 def claves(
+    t_trig=0,
     amplitude=0.5, 
     out_bus=0
 ) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[1, 1, 0], durations=[0, 0.1], curves=[-20.0]), done_action=2)
-    sig = SinOsc.ar(frequency=2500, phase=pi/2) * env * amplitude
-    sig = Pan2.ar(source=sig, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    env = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 0.1], curves=[-20.0]), gate=t_trig, done_action=0)
+    sig = _sine(cycle=_cycle(frequency=2500, trigger=t_trig)) * (env * (amplitude * CENTER_PAN_LEVEL))
+    Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
+@synthdef('tr')
 def maracas(
+    t_trig=0,
     amplitude=0.5, 
     out_bus=0
 ) -> None:
-    env = EnvGen.kr(envelope=Envelope(amplitudes=[0.3, 1, 0], durations=[0.027, 0.07], curves=[-250.0]), done_action=2)
-    sig = WhiteNoise.ar() * env * amplitude
+    env = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.3, 1, 0], durations=[0, 0.027, 0.07], curves=[-250.0]), gate=t_trig, done_action=0)
+    sig = WhiteNoise.ar() * (env * (amplitude * CENTER_PAN_LEVEL))
     sig = HPF.ar(source=sig, frequency=5500)
-    sig = Pan2.ar(source=sig, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    Out.ar(bus=out_bus, source=[sig, sig])
 
-@synthdef()
+@synthdef('tr')
 def cow_bell(
+    t_trig=0,
     amplitude=0.5, 
     out_bus=0
 ) -> None:
-    atkenv = EnvGen.kr(envelope=Envelope.percussive(0, 1, 1, -215.0), done_action=0)
-    env = EnvGen.kr(envelope=Envelope.percussive(0.01, 9.5, 1, -90.0), done_action=2)
+    atkenv = EnvGen.kr(envelope=Envelope.percussive(0, 1, 1, -215.0), gate=t_trig, done_action=0)
+    env = EnvGen.kr(envelope=Envelope.percussive(0.01, 9.5, 1, -90.0), gate=t_trig, done_action=0)
     pul1 = LFPulse.ar(frequency=811.16)
     pul2 = LFPulse.ar(frequency=538.75)
-    atk = (pul1 + pul2) * atkenv * 6
-    datk = (pul1 + pul2) * env
-    sig = (atk + datk) * amplitude
+    # The attack and decay both scale the same pulses, so sum their envelopes instead.
+    sig = (pul1 + pul2) * ((atkenv * 6 + env) * (amplitude * CENTER_PAN_LEVEL))
     sig = HPF.ar(source=sig, frequency=250)
     sig = LPF.ar(source=sig, frequency=4500)
-    sig = Pan2.ar(source=sig, position=0.0)
-    Out.ar(bus=out_bus, source=sig)
+    Out.ar(bus=out_bus, source=[sig, sig])
 
 @synthdef()
+def metal_source(
+    out_bus=0,
+) -> None:
+    # A single synth of this writes the square waves to a bus, which the
+    # hi-hats and cymbal read from, rather than each running its own.
+    Out.ar(bus=out_bus, source=Mix.new(LFPulse.ar(frequency=METAL_FREQUENCIES)))
+
+@synthdef('tr')
 def closed_high_hat(
+    t_trig=0,
     amplitude=0.5, 
+    metal_bus=0,
     out_bus=0,
     pan=0.0,
 ) -> None:
-    env = EnvGen.kr(envelope=Envelope.percussive(0.005, 0.42, 1, -30), done_action=2)
-    osc1 = LFPulse.ar(frequency=203.52)
-    osc2 = LFPulse.ar(frequency=366.31)
-    osc3 = LFPulse.ar(frequency=301.77)
-    osc4 = LFPulse.ar(frequency=518.19)
-    osc5 = LFPulse.ar(frequency=811.16)
-    osc6 = LFPulse.ar(frequency=538.75)
-    sighi = osc1 + osc2 + osc3 + osc4 + osc5 + osc6
-    siglow = osc1 + osc2 + osc3 + osc4 + osc5 + osc6
+    env = EnvGen.kr(envelope=Envelope.percussive(0.005, 0.42, 1, -30), gate=t_trig, done_action=0)
+    # Both filter chains share the one mix of the oscillators.
+    sighi = siglow = In.ar(bus=metal_bus)
     sighi = BPF.ar(source=sighi, frequency=8900, reciprocal_of_q=1)
     sighi = HPF.ar(source=sighi, frequency=9000)
     siglow = BBandPass.ar(source=siglow, frequency=8900, bandwidth=0.8)
     siglow = BHiPass.ar(source=siglow, frequency=9000, reciprocal_of_q=0.3)
     sig = BPeakEQ.ar(source=(siglow+sighi), frequency=9700, reciprocal_of_q=0.8, gain=0.7)
-    sig = sig * env * amplitude
+    sig = sig * (env * amplitude)
     sig = Pan2.ar(source=sig, position=pan)
     Out.ar(bus=out_bus, source=sig)
 
-@synthdef()
+@synthdef('tr')
 def open_high_hat(
+    t_trig=0,
     amplitude=0.5,
+    metal_bus=0,
     out_bus=0,
 ) -> None:
-    env1 = EnvGen.kr(envelope=Envelope.percussive(0.1, 0.5, curve=-3), done_action=2)
-    env2 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 0.5*5], curves=[-150.0]), done_action=0)
-    osc1 = LFPulse.ar(frequency=203.52) * 0.6
-    osc2 = LFPulse.ar(frequency=366.31) * 0.6
-    osc3 = LFPulse.ar(frequency=301.77) * 0.6
-    osc4 = LFPulse.ar(frequency=518.19) * 0.6
-    osc5 = LFPulse.ar(frequency=811.16) * 0.6
-    osc6 = LFPulse.ar(frequency=538.75) * 0.6
-    sig = osc1 + osc2 + osc3 + osc4 + osc5 +osc6
+    env1 = EnvGen.kr(envelope=Envelope.percussive(0.1, 0.5, curve=-3), gate=t_trig, done_action=0)
+    env2 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 0.5*5], curves=[-150.0]), gate=t_trig, done_action=0)
+    sig = In.ar(bus=metal_bus) * 0.6
     sig = BLowShelf.ar(source=sig, frequency=990, reciprocal_of_s=2, gain=-3)
     sig = BPF.ar(source=sig, frequency=7700)
     sig = BPeakEQ.ar(source=sig, frequency=7200, reciprocal_of_q=0.5, gain=5)
     sig = BHiPass.ar(source=sig, frequency=8100, reciprocal_of_q=0.7)
     sig = BHiShelf.ar(source=sig, frequency=9400, reciprocal_of_s=1, gain=5)
-    siga = sig * env1 * 0.6
-    sigb = sig * env2
-    sum = siga + sigb
+    # Both envelopes scale the same signal, and the LPF is linear, so the
+    # envelopes and output gain are combined into a single multiply.
+    sum = sig * ((env1 * 0.6 + env2) * (amplitude * (2 * CENTER_PAN_LEVEL)))
     sum = LPF.ar(source=sum, frequency=4000)
-    sum = Pan2.ar(source=sum, position=0.0)
-    sum = sum * amplitude * 2
-    Out.ar(bus=out_bus, source=sum)
+    Out.ar(bus=out_bus, source=[sum, sum])
 
-@synthdef()
+@synthdef('tr')
 def cymbal(
+    t_trig=0,
     amplitude=0.5, 
+    metal_bus=0,
     out_bus=0,
     tone=0.002,
 ) -> None:
-    env1 = EnvGen.kr(envelope=Envelope.percussive(0.3, 2.0, curve=-3), done_action=2)
-    env2 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.6, 0], durations=[0.1, 2.0*0.7], curves=[-5.0]), done_action=0)
-    env2b = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.3, 0], durations=[0.1, 2.0*20], curves=[-120.0]), done_action=0)
-    env3 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 2.0*5], curves=[-150.0]), done_action=0)
-
-    osc1 = LFPulse.ar(frequency=203.52) * 0.6
-    osc2 = LFPulse.ar(frequency=366.31) * 0.6
-    osc3 = LFPulse.ar(frequency=301.77) * 0.6
-    osc4 = LFPulse.ar(frequency=518.19) * 0.6
-    osc5 = LFPulse.ar(frequency=811.16) * 0.6
-    osc6 = LFPulse.ar(frequency=538.75) * 0.6
-    sig = osc1 + osc2 + osc3 + osc4 + osc5 +osc6
+    env1 = EnvGen.kr(envelope=Envelope.percussive(0.3, 2.0, curve=-3), gate=t_trig, done_action=0)
+    env2 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.6, 0], durations=[0.1, 2.0*0.7], curves=[-5.0]), gate=t_trig, done_action=0)
+    env2b = EnvGen.kr(envelope=Envelope(amplitudes=[0, 0.3, 0], durations=[0.1, 2.0*20], curves=[-120.0]), gate=t_trig, done_action=0)
+    env3 = EnvGen.kr(envelope=Envelope(amplitudes=[0, 1, 0], durations=[0, 2.0*5], curves=[-150.0]), gate=t_trig, done_action=0)
+
+    sig = In.ar(bus=metal_bus) * 0.6
     sig1 = BLowShelf.ar(source=sig, frequency=2000, reciprocal_of_s=1, gain=5)
     sig1 = BPF.ar(source=sig1, frequency=3000)
     sig1 = BPeakEQ.ar(source=sig1, frequency=2400, reciprocal_of_q=0.5, gain=5)
     sig1 = BHiPass.ar(source=sig1, frequency=1550, reciprocal_of_q=0.7)
     sig1 = LPF.ar(source=sig1, frequency=3000)
     sig1 = BLowShelf.ar(source=sig1, frequency=1000, reciprocal_of_s=1, gain=0)
-    sig1 = sig1 * env1 * tone
+    sig1 = sig1 * (env1 * tone)
     sig2 = BLowShelf.ar(source=sig, frequency=990, reciprocal_of_s=2, gain=-5)
     sig2 = BPF.ar(source=sig2, frequency=7400)
     sig2 = BPeakEQ.ar(source=sig2, frequency=7200, reciprocal_of_q=0.5, gain=5)
     sig2 = BHiPass.ar(source=sig2, frequency=6800, reciprocal_of_q=0.7)
     sig2 = BHiShelf.ar(source=sig2, frequency=10000, reciprocal_of_s=1, gain=-4)
-    sig2a = sig2 * env2 * 0.3
-    sig2b = sig2 * env2b * 0.6
+    sig2 = sig2 * (env2 * 0.3 + env2b * 0.6)
     sig3 = BLowShelf.ar(source=sig, frequency=990, reciprocal_of_s=2, gain=-15)
     sig3 = BPF.ar(source=sig3, frequency=6500)
     sig3 = BPeakEQ.ar(source=sig3, frequency=7400, reciprocal_of_q=0.35, gain=10)
     sig3 = BHiPass.ar(source=sig3, frequency=10500, reciprocal_of_q=0.8)
     sig3 = sig3 * env3
-    sum = sig1 + sig2a + sig2b + sig3
+    sum = sig1 + sig2 + sig3
     sum = LPF.ar(source=sum, frequency=4000)
-    sum = Pan2.ar(source=sum, position=0.0)
-    sum = sum * amplitude
-    Out.ar(bus=out_bus, source=sum)
\ No newline at end of file
+    sum = sum * (amplitude * CENTER_PAN_LEVEL)
+    Out.ar(bus=out_bus, source=[sum, sum])
+
+# Every SynthDef in this module, so they can all be sent to the server at once.
+ALL_SYNTHDEFS: tuple[SynthDef, ...] = (
+    bass_drum,
+    snare,
+    clap_dry,
+    low_tom,
+    medium_tom,
+    high_tom,
+    low_conga,
+    medium_conga,
+    high_conga,
+    rim_shot,
+    claves,
+    maracas,
+    cow_bell,
+    metal_source,
+    closed_high_hat,
+    open_high_hat,
+    cymbal,
+)
@@ -3,6 +3,11 @@
 This script creates a polyphonic synthesizer.  So
 multiple notes can be played simultaneously.
 
+By default every MIDI input is opened.  To only use some of them,
+set the MIDI_INPUT_PORTS environment variable to a comma-separated
+list, e.g. MIDI_INPUT_PORTS="KeyStep,nanoKEY".  Only inputs whose
+names contain one of the entries are opened.
+
 Copyright 2025, Andrew Clark
 
 This program is free software: you can redistribute it and/or modify 
@@ -18,81 +23,143 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License 
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
+import os
+import time
+
 import mido
 from mido.ports import MultiPort
 
-from supriya import Envelope, Server, synthdef, Synth
+from supriya import AddAction, Envelope, Server, synthdef, Synth
 from supriya.conversions import midi_note_number_to_frequency
-from supriya.ugens import EnvGen, Limiter, LFSaw, Out
+from supriya.ugens import EnvGen, In, Limiter, LFSaw, Out, ReplaceOut
+
+
+# Parts of the names of the MIDI inputs to open, read once at startup.
+# None means open every input.
+MIDI_PORT_FILTERS: list[str] | None = [f for f in os.environ.get('MIDI_INPUT_PORTS', '').split(',') if f] or None
+# How long to wait between checks for pending MIDI messages, in seconds.
+POLL_INTERVAL: float = 0.001
+# The frequency of every MIDI note number, worked out once up front.
+NOTE_FREQUENCIES: tuple[float, ...] = tuple(midi_note_number_to_frequency(midi_note_number=n) for n in range(128))
 
 
-def open_multi_inport() -> MultiPort:
+def open_multi_inport(name_filters: list[str] | None = None) -> MultiPort:
     """Create a MultiPort that accepts all incoming MIDI messages.
 
     This is the easiest way to handle the fact that people using
     this script could have an input port named anything.
+
+    Args:
+        name_filters: only open ports whose names contain one of these.
+            If None, open every port.
     """
-    inports = [mido.open_input(p) for p in mido.get_input_names()]
+    input_names = mido.get_input_names()
+    if name_filters is not None:
+        input_names = [p for p in input_names if any(f in p for f in name_filters)]
+    inports = [mido.open_input(p) for p in input_names]
     return MultiPort(inports)
 
 def handle_midi_message(message: mido.Message, server: Server, notes: dict[int, Synth]) -> None:
     """Deal with a new MIDI message.
 
     This function currently only handles Note On and Note Off 
-    messages.
+    messages.  Others are ignored.
 
     Args:
         message: a MIDI message.
     """
-    if message.type == 'note_on':
-        frequency = midi_note_number_to_frequency(midi_note_number=message.note)
-        synth = server.add_synth(synthdef=saw, frequency=frequency)
-        notes[message.note] = synth
+    handler = MIDI_MESSAGE_HANDLERS.get(message.type)
+    if handler is not None:
+        handler(message=message, server=server, notes=notes)
+
+def start_note(message: mido.Message, server: Server, notes: dict[int, Synth]) -> None:
+    """Start a synth playing the note of a Note On message.
+
+    Args:
+        message: a MIDI Note On message.
+    """
+    frequency = NOTE_FREQUENCIES[message.note]
+    synth = server.add_synth(synthdef=saw, frequency=frequency)
+    notes[message.note] = synth
+
+def stop_note(message: mido.Message, server: Server, notes: dict[int, Synth]) -> None:
+    """Release the synth playing the note of a Note Off message.
+
+    Args:
+        message: a MIDI Note Off message.
+    """
+    if message.note in notes:
+        notes[message.note].set(gate=0)
+        del notes[message.note]
 
-    if message.type == 'note_off':
-        if message.note in notes:
-            notes[message.note].set(gate=0)
-            del notes[message.note]
+# Which function handles each type of MIDI message.
+MIDI_MESSAGE_HANDLERS = {
+    'note_on': start_note,
+    'note_off': stop_note,
+}
 
 def initialize_supriya() -> Server:
     """Initialize the relevant Supriya objects."""
     server = Server().boot()
-    _ = server.add_synthdefs(saw)
+    _ = server.add_synthdefs(limiter, saw)
     # Wait for the server to fully load the SynthDef before proceeding.
     server.sync()
+    # Notes are added at the head, so the limiter at the tail runs after all of them.
+    _ = server.add_synth(synthdef=limiter, add_action=AddAction.ADD_TO_TAIL)
 
     return server
 
 def listen_for_midi_messages(multi_inport: MultiPort, notes: dict[int, Synth], server: Server) -> None:
     """Listen for incoming MIDI messages in a non-blocking way.
     
-    mido's iter_pending() is non-blocking.
+    mido's iter_pending() is non-blocking.  Between checks the loop
+    sleeps for POLL_INTERVAL, so it doesn't keep a CPU core busy.
     """
+    iter_pending = multi_inport.iter_pending
     while True:
-        for message in multi_inport.iter_pending():
+        for message in iter_pending():
             handle_midi_message(message=message, notes=notes, server=server)
 
+        time.sleep(POLL_INTERVAL)
+
 @synthdef()
-def saw(frequency=440.0, amplitude=0.5, gate=1) -> None:
-    """Create a SynthDef.  SynthDefs are used to create Synth instances
-    that play the notes.
+def limiter(bus=0) -> None:
+    """Create a SynthDef that limits everything written to the outputs.
+
+    A single Synth of this runs after all of the notes, rather than
+    every note having its own Limiter.
 
     WARNING: It is very easy to end up with a volume MUCH higher than
     intended when using SuperCollider.  I've attempted to help with
     this by adding a Limiter UGen to this SynthDef.  Depending on your
     OS, audio hardware, and possibly a few other factors, this might
     set the volume too low to be heard.  If so, first adjust the Limiter's
-    `level` argument, then adjust the SynthDef's `amplitude` argument.
+    `level` argument, then adjust the saw SynthDef's `amplitude` argument.
     NEVER set the `level` to anything higher than 1.  YOU'VE BEEN WARNED!
 
+    Args:
+        bus: the first of the two output buses to limit.
+    """
+    signal = In.ar(bus=bus, channel_count=2)
+    signal = Limiter.ar(duration=0.01, level=0.1, source=signal)
+    ReplaceOut.ar(bus=bus, source=signal)
+
+@synthdef()
+def saw(frequency=440.0, amplitude=0.1, gate=1) -> None:
+    """Create a SynthDef.  SynthDefs are used to create Synth instances
+    that play the notes.
+
+    The volume is kept in check by the limiter SynthDef.  A single note
+    peaks at `amplitude`, which defaults to the limiter's level, so the
+    limiter only acts when notes add up to more than that.
+
     Args:
         frequency: the frequency in hertz of a note.
-        amplitude: the volume.
+        amplitude: the volume, as the peak level of the saw.
         gate: an int, 1 or 0, that controls the envelope.
     """
     signal = LFSaw.ar(frequency=[frequency, frequency - 2])
     signal *= amplitude
-    signal = Limiter.ar(duration=0.01, level=0.1, source=signal)
 
     adsr = Envelope.adsr()
     env = EnvGen.kr(envelope=adsr, gate=gate, done_action=2)
@@ -102,6 +169,6 @@ def saw(frequency=440.0, amplitude=0.5, gate=1) -> None:
 
 if __name__ == '__main__':
     server = initialize_supriya()
-    multi_inport = open_multi_inport()
+    multi_inport = open_multi_inport(name_filters=MIDI_PORT_FILTERS)
     notes: dict[int, Synth] = {}
     listen_for_midi_messages(multi_inport=multi_inport, notes=notes, server=server)
\ No newline at end of file
@@ -5,6 +5,11 @@ adding delay and reverb synths, and accepting MIDI
 Control Change messages to change some of the effects'
 parameters.
 
+By default every MIDI input is opened.  To only use some of them,
+set the MIDI_INPUT_PORTS environment variable to a comma-separated
+list, e.g. MIDI_INPUT_PORTS="KeyStep,nanoKEY".  Only inputs whose
+names contain one of the entries are opened.
+
 Copyright 2025, Andrew Clark
 
 This program is free software: you can redistribute it and/or modify 
@@ -20,6 +25,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License 
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
+import os
+import time
+from collections import deque
+
 import mido
 from mido.ports import MultiPort
 
@@ -31,34 +40,76 @@ from synth_defs import delay, reverb, saw
 
 DELAY_CC_NUM: int = 0
 REVERB_CC_NUM: int = 1
+# The control numbers that change an effect.  Any others are ignored.
+EFFECT_CC_NUMS: frozenset[int] = frozenset((DELAY_CC_NUM, REVERB_CC_NUM))
+# Substrings picked from the comma-separated MIDI_INPUT_PORTS environment
+# variable.  An input is opened if its name contains one; if none are given,
+# every input is opened.
+MIDI_PORT_FILTERS: list[str] | None = [f for f in os.environ.get('MIDI_INPUT_PORTS', '').split(',') if f] or None
+# Seconds to sleep whenever no MIDI messages are waiting.
+POLL_INTERVAL: float = 0.001
+# How often to pass Control Change values on to the effects, in nanoseconds.
+# Any values that arrive in between are coalesced, keeping only the latest.
+CONTROL_CHANGE_INTERVAL_NS: int = 10_000_000
+# How many notes can play at once.
+VOICE_COUNT: int = 16
+
+def apply_control_changes(control_changes: dict[int, int], decay_time_bus: Bus, mix_bus: Bus) -> None:
+    """Change the effects' parameters from Control Change values.
+
+    The effects read these parameters from control buses, so each
+    change is a single /c_set.
+
+    Args:
+        control_changes: the latest value for each control number.
+    """
+    # Figure out which parameter should be changed based on the 
+    # control number.
+    if DELAY_CC_NUM in control_changes:
+        decay_time_bus.set(value=DECAY_TIMES[control_changes[DELAY_CC_NUM]])
 
-def create_buses(server: Server) -> tuple[Bus, Bus]:
+    if REVERB_CC_NUM in control_changes:
+        mix_bus.set(value=REVERB_MIXES[control_changes[REVERB_CC_NUM]])
+
+def create_buses(server: Server) -> tuple[Bus, Bus, Bus, Bus]:
     """Create buses.
 
     We need busses to route the saw synth's audio through,
     and groups to keep the order of execution correct on 
-    the SuperCollider server.
+    the SuperCollider server.  The effects' parameters that
+    Control Change messages change are held in control buses.
     """
     delay_bus = server.add_bus(calculation_rate='audio')
     reverb_bus = server.add_bus(calculation_rate='audio')
+    decay_time_bus = server.add_bus(calculation_rate='control')
+    mix_bus = server.add_bus(calculation_rate='control')
 
-    return delay_bus, reverb_bus
+    return delay_bus, reverb_bus, decay_time_bus, mix_bus
 
-def create_effects_synths(delay_bus: Bus, effects_group: Group, reverb_bus: Bus) -> None:
+def create_effects_synths(
+        decay_time_bus: Bus, 
+        delay_bus: Bus, 
+        effects_group: Group, 
+        mix_bus: Bus, 
+        reverb_bus: Bus
+) -> None:
     """Create the effects synths."""
+    decay_time_bus.set(value=5.0)
+    mix_bus.set(value=0.33)
+
     effects_group.add_synth(
         synthdef=delay,
         in_bus=delay_bus,
         maximum_delay_time=0.2, 
         delay_time=0.2, 
-        decay_time=5.0,
+        decay_time_bus=decay_time_bus,
         out_bus=reverb_bus
     )
 
     effects_group.add_synth(
         synthdef=reverb,
         in_bus=reverb_bus,
-        mix=0.33,
+        mix_bus=mix_bus,
         room_size=1.0,
         damping=0.5,
         out_bus=0,
@@ -75,46 +126,44 @@ def create_groups(server: Server) -> tuple[Group, Group]:
     order, with the sound-producing synth's audio signal being at 
     the head, and the sound-consuming synths (effects) at the tail.
     """
-    # All of the ephemeral saw synths will be added to this group.
+    # All of the saw synths will be added to this group.
     synth_group = server.add_group()
     effects_group = server.add_group(add_action=AddAction.ADD_AFTER)
 
     return synth_group, effects_group
 
+def create_voices(delay_bus: Bus, synth_group: Group) -> deque[Synth]:
+    """Create the saw synths that play the notes.
+
+    Rather than adding a synth for every Note On, VOICE_COUNT
+    synths are added up front, silent, and reused.  They start
+    paused, as they would be after playing a note.
+
+    Returns:
+        The synths, all of them free to play a note.
+    """
+    voices = deque()
+    for _ in range(VOICE_COUNT):
+        synth = synth_group.add_synth(synthdef=saw, gate=0, out_bus=delay_bus)
+        synth.pause()
+        voices.append(synth)
+
+    return voices
+
 def handle_midi_message(
-        delay_bus: Bus, 
-        effects_group: Group, 
+        free_voices: deque[Synth], 
         message: mido.Message, 
-        notes: dict[int, Synth], 
-        synth_group: Group
+        notes: dict[int, Synth]
 ) -> None:
     """Deal with a new MIDI message., 
 
-    This function currently only handles Note On, Note Off 
-    and Control Change messages.
+    This function currently only handles Note On and Note Off
+    messages.  Others are ignored.  Control Change messages never
+    get here, as listen_for_midi_messages coalesces them instead.
     """
-    global DELAY_CC_NUM
-    global REVERB_CC_NUM
-
-    if message.type == 'note_on':
-        frequency = midi_note_number_to_frequency(midi_note_number=message.note + 60)
-        synth = synth_group.add_synth(synthdef=saw, frequency=frequency, out_bus=delay_bus)
-        notes[message.note] = synth
-
-    if message.type == 'note_off':
-        notes[message.note].set(gate=0)
-        del notes[message.note]
-    
-    if message.type == 'control_change':
-        # Figure out which parameter should be changed based on the 
-        # control number.
-        if message.is_cc(DELAY_CC_NUM):
-            scaled_decay_time = scale_float(value=message.value, target_min=0.0, target_max=10.0)
-            effects_group.set(decay_time=scaled_decay_time)
-            
-        if message.is_cc(REVERB_CC_NUM):
-            scaled_reverb_mix = scale_float(value=message.value, target_min=0.0, target_max=1.0)
-            effects_group.set(mix=scaled_reverb_mix)
+    handler = MIDI_MESSAGE_HANDLERS.get(message.type)
+    if handler is not None:
+        handler(free_voices=free_voices, message=message, notes=notes)
 
 def initialize_server() -> Server:
     """Initialize the server."""
@@ -126,30 +175,80 @@ def initialize_server() -> Server:
     return server
 
 def listen_for_midi_messages(
-        delay_bus: Bus, 
-        effects_group: Group, 
+        decay_time_bus: Bus, 
+        free_voices: deque[Synth], 
+        mix_bus: Bus, 
         multi_inport: MultiPort,
         notes: dict[int, Synth], 
-        synth_group: Group
+        server: Server
 ) -> None:
-    """Listen for incoming MIDI messages."""
+    """Listen for incoming MIDI messages.
+
+    mido's iter_pending() is non-blocking.  Between checks the loop
+    sleeps for POLL_INTERVAL, so it doesn't keep a CPU core busy.
+    MultiPort's blocking receive() can't be used instead, as it never
+    returns.
+
+    Turning a knob sends a stream of Control Change messages, far
+    more than the effects need.  So they're held back, and only the
+    latest value for each control is passed on, at most once every
+    CONTROL_CHANGE_INTERVAL_NS.
+
+    Everything sent to the server for one check, such as a chord's
+    worth of new synths, goes in a single OSC bundle.
+    """
+    iter_pending = multi_inport.iter_pending
+    pending_control_changes: dict[int, int] = {}
+    last_control_change_ns = 0
     while True:
-        for message in multi_inport.iter_pending():
-            handle_midi_message(
-                delay_bus=delay_bus,
-                effects_group=effects_group,
-                message=message,
-                notes=notes,
-                synth_group=synth_group,
-            )
-
-def open_multi_inport() -> MultiPort:
+        messages = []
+        for message in iter_pending():
+            if message.type == 'control_change':
+                if message.control in EFFECT_CC_NUMS:
+                    pending_control_changes[message.control] = message.value
+            else:
+                messages.append(message)
+
+        send_control_changes = False
+        if pending_control_changes:
+            now_ns = time.monotonic_ns()
+            if now_ns - last_control_change_ns >= CONTROL_CHANGE_INTERVAL_NS:
+                send_control_changes = True
+                last_control_change_ns = now_ns
+
+        if messages or send_control_changes:
+            with server.at():
+                for message in messages:
+                    handle_midi_message(
+                        free_voices=free_voices,
+                        message=message,
+                        notes=notes,
+                    )
+
+                if send_control_changes:
+                    apply_control_changes(
+                        control_changes=pending_control_changes,
+                        decay_time_bus=decay_time_bus,
+                        mix_bus=mix_bus,
+                    )
+                    pending_control_changes.clear()
+
+        time.sleep(POLL_INTERVAL)
+
+def open_multi_inport(name_filters: list[str] | None = None) -> MultiPort:
     """Create a MultiPort that accepts all incoming MIDI messages.
 
     This is the easiest way to handle the fact that people using
     this script could have an input port named anything.
+
+    Args:
+        name_filters: only open ports whose names contain one of these.
+            If None, open every port.
     """
-    inports = [mido.open_input(p) for p in mido.get_input_names()]
+    input_names = mido.get_input_names()
+    if name_filters is not None:
+        input_names = [p for p in input_names if any(f in p for f in name_filters)]
+    inports = [mido.open_input(p) for p in input_names]
     
     return MultiPort(inports)
 
@@ -169,23 +268,91 @@ def scale_float(value: int, target_min: float, target_max: float):
     scaled_value = (value - source_min) * (target_max - target_min) / (source_max - source_min) + target_min
     return round(number=scaled_value, ndigits=2)
 
+def set_real_time_priority() -> None:
+    """Ask the OS to schedule this process ahead of ordinary ones.
+
+    Call it before opening the MIDI inputs, so the threads that read
+    them start with the same policy.  It's skipped where the OS doesn't
+    support or allow it.
+    """
+    try:
+        priority = os.sched_get_priority_min(os.SCHED_RR)
+        os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(priority))
+    except (AttributeError, OSError):
+        pass
+
+def start_note(
+        free_voices: deque[Synth], 
+        message: mido.Message, 
+        notes: dict[int, Synth]
+) -> None:
+    """Start a synth playing the note of a Note On message.
+
+    The synth that was released longest ago is used.  If every synth
+    is playing, the one playing the oldest note is taken over.
+    """
+    frequency = NOTE_FREQUENCIES[message.note]
+    if message.note not in notes and free_voices:
+        synth = free_voices.popleft()
+        # Synths pause themselves once their envelope has finished.
+        synth.unpause()
+        synth.set(frequency=frequency, gate=1)
+    else:
+        # Either the note is already playing, or its synth is taken from
+        # the oldest note.  The gate is still 1, so retrigger the envelope.
+        held_note = message.note if message.note in notes else next(iter(notes))
+        synth = notes.pop(held_note)
+        synth.set(frequency=frequency, t_retrigger=1)
+
+    notes[message.note] = synth
+
+def stop_note(
+        free_voices: deque[Synth], 
+        message: mido.Message, 
+        notes: dict[int, Synth]
+) -> None:
+    """Release the synth playing the note of a Note Off message."""
+    # The note's synth may have been taken over by a newer note.
+    synth = notes.pop(message.note, None)
+    if synth is not None:
+        synth.set(gate=0)
+        free_voices.append(synth)
+
+# Which function handles each type of MIDI message.
+MIDI_MESSAGE_HANDLERS = {
+    'note_off': stop_note,
+    'note_on': start_note,
+}
+
+# MIDI notes, and Control Change values, can only be 0-127, so everything
+# worked out from them is looked up in tables made once, up front.
+# Notes are played five octaves higher than the note number.
+NOTE_FREQUENCIES: tuple[float, ...] = tuple(midi_note_number_to_frequency(midi_note_number=n + 60) for n in range(128))
+DECAY_TIMES: tuple[float, ...] = tuple(scale_float(value=v, target_min=0.0, target_max=10.0) for v in range(128))
+REVERB_MIXES: tuple[float, ...] = tuple(scale_float(value=v, target_min=0.0, target_max=1.0) for v in range(128))
+
 def main() -> None:
     server = initialize_server()
     synth_group, effects_group = create_groups(server=server)
-    delay_bus, reverb_bus = create_buses(server=server)
+    delay_bus, reverb_bus, decay_time_bus, mix_bus = create_buses(server=server)
     create_effects_synths(
+        decay_time_bus=decay_time_bus,
         delay_bus=delay_bus, 
         effects_group=effects_group,
+        mix_bus=mix_bus,
         reverb_bus=reverb_bus
     )
-    multi_inport = open_multi_inport()
+    free_voices = create_voices(delay_bus=delay_bus, synth_group=synth_group)
+    set_real_time_priority()
+    multi_inport = open_multi_inport(name_filters=MIDI_PORT_FILTERS)
     notes: dict[int, Synth] = {}
     listen_for_midi_messages(
-        delay_bus=delay_bus, 
-        effects_group=effects_group,
+        decay_time_bus=decay_time_bus,
+        free_voices=free_voices,
+        mix_bus=mix_bus,
         multi_inport=multi_inport,
         notes=notes,
-        synth_group=synth_group
+        server=server
     )
 
 if __name__ == '__main__':
@@ -1,5 +1,5 @@
-from supriya import Envelope, synthdef
-from supriya.ugens import CombL, EnvGen, FreeVerb, In, Limiter, LFSaw, Out
+from supriya import DoneAction, Envelope, synthdef
+from supriya.ugens import CombL, ControlDur, EnvGen, FreeVerb, In, Limiter, LFSaw, Out, Trig1
 
 
 @synthdef()
@@ -7,10 +7,12 @@ def delay(
     in_bus: 2, 
     maximum_delay_time: 0.2, 
     delay_time: 0.2, 
-    decay_time: 1.0,
+    decay_time_bus: 0,
     out_bus: 0
 ):
     signal = In.ar(bus=in_bus, channel_count=2)
+    # Read from a control bus, so it can be changed with a single /c_set.
+    decay_time = In.kr(bus=decay_time_bus, channel_count=1)
     signal = CombL.ar(
         delay_time=delay_time,
         decay_time = decay_time,
@@ -22,17 +24,19 @@ def delay(
 @synthdef()
 def reverb(
     in_bus=2,
-    mix=0.33,
+    mix_bus=1,
     room_size=0.5,
     damping=0.5,
     out_bus=0,
 ):
     signal = In.ar(bus=in_bus, channel_count=2)
+    # Read from a control bus, so it can be changed with a single /c_set.
+    mix = In.kr(bus=mix_bus, channel_count=1)
     signal = FreeVerb.ar(source=signal, mix=mix, room_size=room_size, damping=damping)
     Out.ar(bus=out_bus, source=signal)
 
-@synthdef()
-def saw(frequency=440.0, amplitude=0.5, gate=1, out_bus=0) -> None:
+@synthdef('tr')
+def saw(t_retrigger=0, frequency=440.0, amplitude=0.5, gate=1, out_bus=0) -> None:
     """Create a SynthDef.  SynthDefs are used to create Synth instances
     that play the notes.
 
@@ -45,6 +49,8 @@ def saw(frequency=440.0, amplitude=0.5, gate=1, out_bus=0) -> None:
     NEVER set the `level` to anything higher than 1.  YOU'VE BEEN WARNED!
 
     Args:
+        t_retrigger: a trigger that restarts the envelope while the gate
+            is held at 1.
         frequency: the frequency in hertz of a note.
         amplitude: the volume.
         gate: an int, 1 or 0, that controls the envelope.
@@ -54,7 +60,13 @@ def saw(frequency=440.0, amplitude=0.5, gate=1, out_bus=0) -> None:
     signal = Limiter.ar(duration=0.01, level=0.1, source=signal)
 
     adsr = Envelope.adsr()
-    env = EnvGen.kr(envelope=adsr, gate=gate, done_action=2)
+    # A retrigger drops the gate to 0 for one control block, so the
+    # envelope sees a fresh 0 -> 1 and starts its attack again.
+    gate -= Trig1.kr(source=t_retrigger, duration=ControlDur.ir())
+    # Each synth is reused for many notes, so rather than being freed
+    # when a released note's envelope finishes, it's paused.  It stops
+    # using CPU until it's unpaused to play another note.
+    env = EnvGen.kr(envelope=adsr, gate=gate, done_action=DoneAction.PAUSE_SYNTH)
     signal *= env
 
     Out.ar(bus=out_bus, source=signal)
\ No newline at end of file
@@ -17,10 +17,12 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
+import inspect
 import sys
+import time
 from math import pi
 
-from supriya import Server, synthdef, UGenOperable
+from supriya import AddAction, Bus, Server, synthdef, SynthDef, UGenOperable
 from supriya.clocks import Clock
 from supriya.conversions import midi_note_number_to_frequency
 from supriya.patterns import EventPattern, RandomPattern, SequencePattern
@@ -29,6 +31,7 @@ from supriya.ugens import (
     Envelope,
     EnvGen,
     FreeVerb,
+    In,
     Out, 
     Pan2,
     SinOsc,
@@ -37,30 +40,47 @@ from supriya.ugens.core import UGenRecursiveInput
 from supriya.ugens.filters import OnePole
 from supriya.ugens.info import SampleDur, SampleRate
 from supriya.ugens.inout import LocalIn, LocalOut
-from supriya.ugens.lines import DC
 from supriya.ugens.noise import IRand
 from supriya.ugens.triggers import Phasor
 
 
 TWO_PI = 2 * pi
 
+def fixed_frequency_synthdef(func) -> SynthDef:
+    """Like @synthdef(), but makes `frequency` an initialization rate parameter.
+
+    The patterns only set a note's frequency when its synth is created,
+    so everything worked out from it, like each OnePole's coefficient,
+    can be worked out once then instead of every control block.
+    """
+    names = list(inspect.signature(func).parameters)
+    rates = ['kr'] * len(names)
+    rates[names.index('frequency')] = 'ir'
+    return synthdef(*rates)(func)
+
 def one_pole_filter(
     frequency: UGenRecursiveInput,
     modulator: UGenRecursiveInput, 
+    nyquist: UGenOperable,
+    sample_duration: UGenOperable,
 ) -> UGenOperable:
-    nyquist = SampleRate.ir() / 2
     clipped_frequency = frequency.clip(-nyquist, nyquist)
-    slope = abs(clipped_frequency) * SampleDur.ir()
+    slope = abs(clipped_frequency) * sample_duration
     return OnePole.ar(source=modulator, coefficient=(-TWO_PI * slope).exponential())
 
 def phase_modulation(
     frequency: UGenRecursiveInput, 
+    sample_duration: UGenOperable,
     modulator: UGenRecursiveInput=0,
 ) -> UGenOperable:
-    phase = Phasor.ar(trigger=0, rate=frequency * SampleDur.ir())
-    return SinOsc.ar(frequency=DC.ar(source=0), phase=(phase + modulator) * TWO_PI)
+    phase = Phasor.ar(trigger=0, rate=frequency * sample_duration)
+    # With a constant frequency of 0, SinOsc only follows its phase input,
+    # and uses its cheaper calculation for a constant frequency.
+    return SinOsc.ar(frequency=0, phase=(phase + modulator) * TWO_PI)
 
 def phase_modulation_operator(
+    nyquist: UGenOperable,
+    sample_duration: UGenOperable,
     adsr=(0.01, 0.3, 0.5, 3.0),
     curve=(-4),
     frequency=440,
@@ -83,31 +103,124 @@ def phase_modulation_operator(
     )
     
     frequency *= ratio
-    modulation = phase_modulation(frequency=frequency, modulator=modulator)
+    modulation = phase_modulation(
+        frequency=frequency,
+        modulator=modulator,
+        sample_duration=sample_duration,
+    )
 
+    # The phase index scaling is folded into the envelope at control rate,
+    # leaving a single audio rate multiply.  OnePole is linear, so scaling
+    # after the filter is the same as scaling before it.
     if is_modulator:
-        modulation /= TWO_PI * phase_index
-        modulation = one_pole_filter(frequency=frequency, modulator=modulation)
+        modulation = one_pole_filter(
+            frequency=frequency,
+            modulator=modulation,
+            nyquist=nyquist,
+            sample_duration=sample_duration,
+        )
+        gain = envelope / (TWO_PI * phase_index)
     else:
-        modulation *= phase_index    
+        gain = envelope * phase_index
     
-    modulation *= envelope
-    
-    return modulation
+    return modulation * gain
 
 def feedback_phase_modulation_operator(
+    nyquist: UGenOperable,
+    sample_duration: UGenOperable,
     frequency=440,
     feedback_index=1.0,
 ) -> None:
     feedback = LocalIn.ar(channel_count=1) / TWO_PI * feedback_index
-    modulator = one_pole_filter(frequency=frequency, modulator=feedback)
+    modulator = one_pole_filter(
+        frequency=frequency,
+        modulator=feedback,
+        nyquist=nyquist,
+        sample_duration=sample_duration,
+    )
     
-    signal = phase_modulation(frequency=frequency, modulator=modulator)
+    signal = phase_modulation(
+        frequency=frequency,
+        modulator=modulator,
+        sample_duration=sample_duration,
+    )
     LocalOut.ar(source=signal)
 
     return signal
 
 @synthdef()
+def reverb(in_bus=0, mix=0.33, room_size=0.5) -> None:
+    """Add reverb to everything written to `in_bus`, then write to the speakers.
+
+    One of these is shared by all the synths playing a pattern,
+    rather than each synth running its own FreeVerb.
+    """
+    signal = In.ar(bus=in_bus, channel_count=1)
+    signal = FreeVerb.ar(source=signal, mix=mix, room_size=room_size, damping=0.5)
+    
+    pan = Pan2.ar(source=signal, position=0.0)
+    Out.ar(bus=0, source=pan)
+
+@synthdef()
+def reverb_with_echo(decay_time=2.0, in_bus=0, mix=0.33, room_size=0.5) -> None:
+    """Like reverb, but followed by a comb filter echo."""
+    signal = In.ar(bus=in_bus, channel_count=1)
+    signal = FreeVerb.ar(source=signal, mix=mix, room_size=room_size, damping=0.5)
+    signal = CombL.ar(
+        delay_time=0.2,
+        decay_time=decay_time,
+        maximum_delay_time=0.2, 
+        source=signal
+    )
+    
+    pan = Pan2.ar(source=signal, position=0.0)
+    Out.ar(bus=0, source=pan)
+
+# The effect each algorithm was voiced with, by algorithm number: FreeVerb's
+# mix and room size, then the comb filter echo's decay time, or None for no
+# echo.  The algorithms write to an effect bus, so they sound as intended
+# only through a reverb or reverb_with_echo with these settings.
+ALGORITHM_EFFECTS: dict[int, tuple[float, float, float | None]] = {
+    1: (0.55, 0.75, 2.0),
+    2: (0.55, 0.75, 2.0),
+    3: (0.55, 0.65, 2.0),
+    4: (0.55, 0.65, None),
+    5: (0.55, 0.75, 2.0),
+    6: (0.55, 0.75, 2.0),
+    7: (0.75, 0.75, 4.0),
+    8: (0.75, 0.65, 4.0),
+}
+
+def add_effect(server: Server, algorithm: int) -> Bus:
+    """Start the effect an algorithm was voiced with.
+
+    The effect is added at the tail, so it runs after the notes.
+
+    Returns:
+        The bus to pass to the algorithm as its effect_bus.
+    """
+    mix, room_size, decay_time = ALGORITHM_EFFECTS[algorithm]
+    bus = server.add_bus(calculation_rate='audio')
+    if decay_time is None:
+        server.add_synth(
+            synthdef=reverb,
+            add_action=AddAction.ADD_TO_TAIL,
+            in_bus=bus,
+            mix=mix,
+            room_size=room_size,
+        )
+    else:
+        server.add_synth(
+            synthdef=reverb_with_echo,
+            add_action=AddAction.ADD_TO_TAIL,
+            decay_time=decay_time,
+            in_bus=bus,
+            mix=mix,
+            room_size=room_size,
+        )
+    return bus
+
+@fixed_frequency_synthdef
 def algorithm_1(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -117,6 +230,7 @@ def algorithm_1(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
@@ -127,17 +241,24 @@ def algorithm_1(
     modulator_ratio_4=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio = ratio
     modulator_ratio_2 = ratio * 1
     modulator_ratio_3 = ratio * 2
     modulator_ratio_4 = ratio * 3
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio_4,
         feedback_index=feedback_index
     )
     
     modulator_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -148,6 +269,8 @@ def algorithm_1(
     )
 
     modulator_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -159,6 +282,8 @@ def algorithm_1(
     modulator_2 += modulator_3
 
     carrier = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -167,18 +292,9 @@ def algorithm_1(
         modulator=modulator_2,
         ratio=carrier_ratio,
     )
-    carrier = FreeVerb.ar(source=carrier, mix=0.55, room_size=0.75, damping=0.5)
-    carrier = CombL.ar(
-        delay_time=0.2,
-        decay_time=2.0,
-        maximum_delay_time=0.2, 
-        source=carrier
-    )
-    
-    pan = Pan2.ar(source=carrier, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)
+    Out.ar(bus=effect_bus, source=carrier * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_2(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -188,6 +304,7 @@ def algorithm_2(
     curve_1=(-4),
     curve_2=(-4),
     curve_4=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
@@ -198,12 +315,17 @@ def algorithm_2(
     modulator_ratio_4=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio=ratio
     modulator_ratio_2=ratio * 4
     modulator_ratio_3=ratio * 2
     modulator_ratio_4=ratio * 8
 
     modulator_4 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_4,
         curve=curve_4,
         frequency=frequency,
@@ -213,6 +335,8 @@ def algorithm_2(
     )
 
     modulator_3 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio_3,
         feedback_index=feedback_index
     )
@@ -220,6 +344,8 @@ def algorithm_2(
     modulator_3 += modulator_4
 
     modulator_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -230,6 +356,8 @@ def algorithm_2(
     )
 
     carrier = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -238,18 +366,9 @@ def algorithm_2(
         modulator=modulator_2 + modulator_4,
         ratio=carrier_ratio,
     )
-    carrier = FreeVerb.ar(source=carrier, mix=0.55, room_size=0.75, damping=0.5)
-    carrier = CombL.ar(
-        delay_time=0.2,
-        decay_time=2.0,
-        maximum_delay_time=0.2, 
-        source=carrier
-    )
-    
-    pan = Pan2.ar(source=carrier, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)
+    Out.ar(bus=effect_bus, source=carrier * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_3(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -259,6 +378,7 @@ def algorithm_3(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
@@ -269,12 +389,17 @@ def algorithm_3(
     modulator_ratio_4=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio = ratio
     modulator_ratio_2 = ratio + 4
     modulator_ratio_3 = ratio + 2
     modulator_ratio_4 = ratio + 1
 
     modulator_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -284,6 +409,8 @@ def algorithm_3(
     )
 
     modulator_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -294,11 +421,15 @@ def algorithm_3(
     )
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio_4,
         feedback_index=feedback_index
     )
 
     carrier = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -307,18 +438,9 @@ def algorithm_3(
         modulator=modulator_2 + modulator_4,
         ratio=carrier_ratio,
     )
-    carrier = FreeVerb.ar(source=carrier, mix=0.55, room_size=0.65, damping=0.5)
-    carrier = CombL.ar(
-        delay_time=0.2,
-        decay_time=2.0,
-        maximum_delay_time=0.2, 
-        source=carrier
-    )
-    
-    pan = Pan2.ar(source=carrier, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)    
+    Out.ar(bus=effect_bus, source=carrier * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_4(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -328,6 +450,7 @@ def algorithm_4(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
@@ -338,17 +461,24 @@ def algorithm_4(
     modulator_ratio_4=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio = ratio
     modulator_ratio_2 = ratio * 4
     modulator_ratio_3 = ratio * 2
     modulator_ratio_4 = ratio + 1
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio_4,
         feedback_index=feedback_index
     )
 
     modulator_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -359,6 +489,8 @@ def algorithm_4(
     )
 
     modulator_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -369,6 +501,8 @@ def algorithm_4(
     )
 
     carrier = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -377,12 +511,9 @@ def algorithm_4(
         modulator=modulator_2 + modulator_3,
         ratio=carrier_ratio,
     )
-    carrier = FreeVerb.ar(source=carrier, mix=0.55, room_size=0.65, damping=0.5)
-    
-    pan = Pan2.ar(source=carrier, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)    
+    Out.ar(bus=effect_bus, source=carrier * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_5(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -393,6 +524,7 @@ def algorithm_5(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
@@ -401,16 +533,23 @@ def algorithm_5(
     modulator_ratio_4=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio_1 = carrier_ratio_3 = ratio
     modulator_ratio_2 = ratio * 4
     modulator_ratio_4 = ratio + 2
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio_4,
         feedback_index=feedback_index
     )
 
     modulator_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -420,6 +559,8 @@ def algorithm_5(
     )
 
     carrier_1 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -430,6 +571,8 @@ def algorithm_5(
     )
 
     carrier_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -441,18 +584,9 @@ def algorithm_5(
 
     output = carrier_1 + carrier_3
 
-    output = FreeVerb.ar(source=output, mix=0.55, room_size=0.75, damping=0.5)
-    output = CombL.ar(
-        delay_time=0.2,
-        decay_time=2.0,
-        maximum_delay_time=0.2, 
-        source=output
-    )
-    
-    pan = Pan2.ar(source=output, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)  
+    Out.ar(bus=effect_bus, source=output * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_6(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -464,12 +598,16 @@ def algorithm_6(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
     modulator_ratio=1, 
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio_1 = ratio * 2
     carrier_ratio_2 = ratio * 4
     carrier_ratio_3 = ratio * 8
@@ -477,11 +615,15 @@ def algorithm_6(
     modulator_ratio = ratio + 2
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio,
         feedback_index=feedback_index
     )
 
     carrier_1 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -491,6 +633,8 @@ def algorithm_6(
     )
 
     carrier_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -501,6 +645,8 @@ def algorithm_6(
     )
 
     carrier_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -511,18 +657,9 @@ def algorithm_6(
 
     output = carrier_1 + carrier_2 + carrier_3
 
-    output = FreeVerb.ar(source=output, mix=0.55, room_size=0.75, damping=0.5)
-    output = CombL.ar(
-        delay_time=0.2,
-        decay_time=2.0,
-        maximum_delay_time=0.2, 
-        source=output
-    )
-    
-    pan = Pan2.ar(source=output, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)
+    Out.ar(bus=effect_bus, source=output * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_7(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -534,12 +671,16 @@ def algorithm_7(
     curve_1=(-4),
     curve_2=(-4),
     curve_3=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
     modulator_ratio=1, 
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio_1 = ratio
     carrier_ratio_2 = ratio + 2
     carrier_ratio_3 = ratio + 4
@@ -547,11 +688,15 @@ def algorithm_7(
     modulator_ratio = ratio + 1
 
     modulator_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * modulator_ratio,
         feedback_index=feedback_index
     )
 
     carrier_1 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -561,6 +706,8 @@ def algorithm_7(
     )
 
     carrier_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -570,6 +717,8 @@ def algorithm_7(
     )
 
     carrier_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -581,18 +730,9 @@ def algorithm_7(
 
     output = carrier_1 + carrier_2 + carrier_3
 
-    output = FreeVerb.ar(source=output, mix=0.75, room_size=0.75, damping=0.5)
-    output = CombL.ar(
-        delay_time=0.2,
-        decay_time=4.0,
-        maximum_delay_time=0.2, 
-        source=output
-    )
-    
-    pan = Pan2.ar(source=output, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)
+    Out.ar(bus=effect_bus, source=output * amplitude)
 
-@synthdef()
+@fixed_frequency_synthdef
 def algorithm_8(
     adsr_1=(0.01, 0.3, 0.5, 3.0),
     adsr_2=(0.01, 0.3, 0.5, 3.0),
@@ -607,17 +747,23 @@ def algorithm_8(
     curve_2=(-4),
     curve_3=(-4),
     curve_4=(-4),
+    effect_bus=0,
     feedback_index=1.0,
     frequency=500, 
     gate=1,
 ) -> None:
     ratio = IRand.ir(minimum=1, maximum=2)
+    # Shared by every operator, rather than each making its own.
+    nyquist = SampleRate.ir() / 2
+    sample_duration = SampleDur.ir()
     carrier_ratio_1 = ratio * 1
     carrier_ratio_2 = ratio * 2
     carrier_ratio_3 = ratio * 4
     carrier_ratio_4 = ratio * 6
 
     carrier_1 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_1,
         curve=curve_1,
         frequency=frequency,
@@ -627,6 +773,8 @@ def algorithm_8(
     )
 
     carrier_2 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_2,
         curve=curve_2,
         frequency=frequency,
@@ -636,6 +784,8 @@ def algorithm_8(
     )
 
     carrier_3 = phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         adsr=adsr_3,
         curve=curve_3,
         frequency=frequency,
@@ -646,6 +796,8 @@ def algorithm_8(
 
     # Special case where a carrier has feedback
     carrier_4 = feedback_phase_modulation_operator(
+        nyquist=nyquist,
+        sample_duration=sample_duration,
         frequency=frequency * carrier_ratio_4,
         feedback_index=feedback_index
     )
@@ -664,16 +816,7 @@ def algorithm_8(
 
     output = carrier_1 + carrier_2 + carrier_3 + carrier_4
 
-    output = FreeVerb.ar(source=output, mix=0.75, room_size=0.65, damping=0.5)
-    output = CombL.ar(
-        delay_time=0.2,
-        decay_time=4.0,
-        maximum_delay_time=0.2, 
-        source=output
-    )
-    
-    pan = Pan2.ar(source=output, position=0.0, level=amplitude)
-    Out.ar(bus=0, source=pan)
+    Out.ar(bus=effect_bus, source=output * amplitude)
 
 
 def main() -> None:
@@ -682,9 +825,16 @@ def main() -> None:
         algorithm_4,
         algorithm_6,
         algorithm_7,
+        reverb,
+        reverb_with_echo,
     )
     server.sync()
 
+    # Each part shares one set of effects between all of its notes.
+    bass_effect_bus = add_effect(server=server, algorithm=4)
+    arpeggio_effect_bus = add_effect(server=server, algorithm=6)
+    pad_effect_bus = add_effect(server=server, algorithm=7)
+
     # Bass
     bass_note = 27
     bass_scale = [0, 3, 8, 12, 3, 7, 10, 14]
@@ -700,6 +850,7 @@ def main() -> None:
         adsr_2=(0.01, 0.5, 0.01, 0.01),
         adsr_3=(0.01, 0.5, 0.01, 0.01),
         amplitude=0.25,
+        effect_bus=bass_effect_bus,
         feedback_index=3.832276,
         phase_index_2=0.197109,
         phase_index_3=2.11338,
@@ -727,39 +878,22 @@ def main() -> None:
         delta=0.0625,
         duration=0.0625,
         amplitude=0.2,
+        effect_bus=arpeggio_effect_bus,
         feedback_index=RandomPattern(minimum=0.0, maximum=15.0),
     )
 
     # Pad
-    pad_sequence = SequencePattern(
-        [
-            [
-                midi_note_number_to_frequency(arpeggio_note + 0),
-                midi_note_number_to_frequency(arpeggio_note + 3),
-                midi_note_number_to_frequency(arpeggio_note + 7),
-                midi_note_number_to_frequency(arpeggio_note + 10),
-            ],
-            [
-                midi_note_number_to_frequency(arpeggio_note + 8),
-                midi_note_number_to_frequency(arpeggio_note + 12),
-                midi_note_number_to_frequency(arpeggio_note + 15),
-                midi_note_number_to_frequency(arpeggio_note + 19),
-            ],
-            [
-                midi_note_number_to_frequency(arpeggio_note + 3),
-                midi_note_number_to_frequency(arpeggio_note + 7),
-                midi_note_number_to_frequency(arpeggio_note + 12),
-                midi_note_number_to_frequency(arpeggio_note + 15),
-            ],
-            [
-                midi_note_number_to_frequency(arpeggio_note + 10),
-                midi_note_number_to_frequency(arpeggio_note + 14),
-                midi_note_number_to_frequency(arpeggio_note + 17),
-                midi_note_number_to_frequency(arpeggio_note + 20),
-            ],
-        ], 
-        iterations=None,
-    )
+    pad_chords = [
+        [0, 3, 7, 10],
+        [8, 12, 15, 19],
+        [3, 7, 12, 15],
+        [10, 14, 17, 20],
+    ]
+    pad_frequencies = [
+        [midi_note_number_to_frequency(n + arpeggio_note) for n in chord]
+        for chord in pad_chords
+    ]
+    pad_sequence = SequencePattern(pad_frequencies, iterations=None)
 
     algorithm_7_pattern = EventPattern(
         frequency=pad_sequence,
@@ -773,6 +907,7 @@ def main() -> None:
         curve_1=(-8),
         curve_2=(-4),
         curve_3=(8),
+        effect_bus=pad_effect_bus,
         feedback_index=RandomPattern(minimum=0.0, maximum=25.0),
     )
 
@@ -783,8 +918,10 @@ def main() -> None:
     algorithm_6_pattern.play(clock=clock, context=server, quantization='1/4')
     algorithm_7_pattern.play(clock=clock, context=server, quantization='1/4')
 
+    # The clock plays the patterns on its own thread, so just sleep here
+    # until Ctrl-C, without keeping a CPU core busy.
     while True:
-        continue
+        time.sleep(1)
 
 if __name__ == '__main__':
     try:
@@ -17,11 +17,16 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from mido import get_input_names, Message, open_input
 from mido.ports import MultiPort
 
 
+# Seconds the listener thread waits before checking its ports again.
+POLL_INTERVAL: float = 0.001
+
+
 class MIDIHandler:
     def __init__(self, message_handler_callback: callable):
         self.message_handler_callback = message_handler_callback
@@ -42,13 +47,31 @@ class MIDIHandler:
 
         This is the easiest way to handle the fact that people using
         this script could have an input port named anything.
+
+        The ports are opened in parallel, as each open can block
+        while the MIDI backend probes the device.
         """
-        inports = [open_input(p) for p in get_input_names()]
+        input_names = get_input_names()
+        with ThreadPoolExecutor(max_workers=len(input_names) or 1) as executor:
+            inports = list(executor.map(open_input, input_names))
         
         return MultiPort(inports)
 
     def listen_for_midi_messages(self) -> Message:
-        """Listen for incoming MIDI messages in a non-blocking way."""
-        while not self.stop_listening_for_input.is_set():
-            for message in self.multi_inport.iter_pending():
-                self.message_handler_callback(message)
+        """Listen for incoming MIDI messages in a non-blocking way.
+
+        Between checks the thread sleeps for POLL_INTERVAL, rather than
+        spinning, but wakes up straight away when exit() is called.
+        MultiPort's blocking receive() can't be used here, as it never
+        returns.
+        """
+        # Bind these once, rather than looking them up on every pass.
+        wait_for_stop = self.stop_listening_for_input.wait
+        iter_pending = self.multi_inport.iter_pending
+        message_handler_callback = self.message_handler_callback
+        while True:
+            for message in iter_pending():
+                message_handler_callback(message)
+
+            if wait_for_stop(timeout=POLL_INTERVAL):
+                break
@@ -35,6 +35,8 @@ class SupriyaStudio:
         self.sampler  = self._initialize_sampler()
         self.mixer = self._initialize_mixer()
         self.sequencer = self._initialize_sequencer()
+        # Must exist before the MIDI handler starts delivering messages.
+        self.midi_message_handlers = self._initialize_midi_message_handlers()
         self.midi_handler = self._initialize_midi_handler()
     
     def exit(self) -> None:
@@ -44,19 +46,22 @@ class SupriyaStudio:
         self.server.quit()
 
     def handle_midi_message(self, message: Message) -> None:
-        if message.type == 'control_change':
-            if message.is_cc(self.sampler.SAMPLE_SELECT_CC_NUM):
-                self.sampler.on_control_change(message=message)
-            
-            if message.control in self.mixer.cc_nums:
-                self.mixer.handle_control_change_message(message=message)
-        
-        if message.type == 'program_change':
-            self.sampler.on_program_change(message=message)
-            return
+        handler = self.midi_message_handlers.get(message.type)
+        if handler is not None:
+            handler(message=message)
+
+    def _on_control_change_message(self, message: Message) -> None:
+        if message.is_cc(self.sampler.SAMPLE_SELECT_CC_NUM):
+            self.sampler.on_control_change(message=message)
         
-        if message.type == 'note_on':
-            self.sequencer.handle_note_on(message=message)
+        if message.control in self.mixer.cc_nums:
+            self.mixer.handle_control_change_message(message=message)
+
+    def _on_note_on_message(self, message: Message) -> None:
+        self.sequencer.handle_note_on(message=message)
+
+    def _on_program_change_message(self, message: Message) -> None:
+        self.sampler.on_program_change(message=message)
 
     def _initialize_sampler(self) -> Sampler:
         tb_303_samples_path = Path(__file__).parent / 'samples/roland_tb_303'
@@ -73,6 +78,14 @@ class SupriyaStudio:
     def _initialize_midi_handler(self) -> MIDIHandler:
         return MIDIHandler(message_handler_callback=self.handle_midi_message)
 
+    def _initialize_midi_message_handlers(self) -> dict[str, callable]:
+        """Map each MIDI message type we care about to its handler."""
+        return {
+            'control_change': self._on_control_change_message,
+            'note_on': self._on_note_on_message,
+            'program_change': self._on_program_change_message,
+        }
+
     def _initialize_mixer(self) -> Mixer:
         return Mixer(
             instrument=self.sampler,